@@ -1,24 +1,77 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation, patches
 
+import packing_cache
+from compact_state import CompactState
+
 # Parametri del problema
 L = 1.0            # lato del quadrato
 r = 0.1            # raggio dei cerchi
 max_iter = 2000    # numero massimo di tentativi
+SEED = 0           # seed del generatore (None = non riproducibile, niente cache)
+COMPACT_STATE = False  # stato float32 + griglia, per r piccolo / N molto grande
+
+
+def save_final_image(centers):
+    fig2, ax2 = plt.subplots(figsize=(6, 6))
+    ax2.set_xlim(0, L)
+    ax2.set_ylim(0, L)
+    ax2.set_aspect('equal')
+    ax2.set_title(f"Random - {len(centers)} cerchi")
+
+    # Aggiunge rettangolo del bordo
+    ax2.add_patch(plt.Rectangle((0, 0), L, L, fill=False, edgecolor='black'))
+
+    # Disegna tutti i cerchi finali
+    for (x, y) in centers:
+        circle = plt.Circle((x, y), radius=r, fill=True, alpha=0.6)
+        ax2.add_patch(circle)
 
-# Strutture dati
-centers = []       # lista dei centri dei cerchi posizionati
-snapshots = []     # snapshot dei centri dopo ogni inserimento riuscito
+    # Salva come PNG
+    plt.savefig("Random_FinalPacking.png", dpi=300)
+    plt.close(fig2)
+    print(f"Immagine finale salvata in 'FinalPacking.png' con {len(centers)} cerchi.")
 
-# Algoritmo "stupido" di posizionamento casuale
-for _ in range(max_iter):
-    x = np.random.uniform(r, L - r)
-    y = np.random.uniform(r, L - r)
-    # verifica vincolo di non sovrapposizione
-    if all((x - xi)**2 + (y - yi)**2 >= (2*r)**2 for xi, yi in centers):
-        centers.append((x, y))
-        snapshots.append(list(centers))
+
+np.random.seed(SEED)
+
+# Cache dei risultati: se già calcolato salta algoritmo e animazione
+PARAMS = {"L": L, "r": r, "max_iter": max_iter, "SEED": SEED, "COMPACT_STATE": COMPACT_STATE}
+cached = packing_cache.lookup(__file__, PARAMS)
+if cached is not None:
+    print(f"Risultato trovato in cache: {len(cached['positions'])} cerchi.")
+    save_final_image(cached["positions"])
+    sys.exit()
+
+if COMPACT_STATE:
+    # Solo inserimenti: ogni snapshot è un prefisso dei centri, basta salvarne la lunghezza
+    state = CompactState(r, L)
+    snapshots = []     # numero di cerchi dopo ogni inserimento riuscito
+    for _ in range(max_iter):
+        x = np.random.uniform(r, L - r)
+        y = np.random.uniform(r, L - r)
+        if state.add(x, y):
+            snapshots.append(len(state))
+    centers = state.positions()
+else:
+    # Strutture dati
+    centers = []       # lista dei centri dei cerchi posizionati
+    snapshots = []     # snapshot dei centri dopo ogni inserimento riuscito
+
+    # Algoritmo "stupido" di posizionamento casuale
+    for _ in range(max_iter):
+        x = np.random.uniform(r, L - r)
+        y = np.random.uniform(r, L - r)
+        # verifica vincolo di non sovrapposizione
+        if all((x - xi)**2 + (y - yi)**2 >= (2*r)**2 for xi, yi in centers):
+            centers.append((x, y))
+            snapshots.append(list(centers))
+
+def snapshot(i):
+    return centers[:snapshots[i]] if COMPACT_STATE else snapshots[i]
 
 # Creazione dell'animazione
 fig, ax = plt.subplots()
@@ -37,14 +90,14 @@ def animate(i):
         c.remove()
     circles.clear()
     # disegna lo stato corrente
-    for (x, y) in snapshots[i]:
+    for (x, y) in snapshot(i):
         c = patches.Circle((x, y), radius=r, fill=True, alpha=0.6)
         ax.add_patch(c)
         circles.append(c)
     # annota il numero di cerchi in alto a sinistra
     ax.text(
         0.02, 0.98,
-        f"Count: {len(snapshots[i])}",
+        f"Count: {len(snapshot(i))}",
         transform=ax.transAxes,
         fontsize=12,
         verticalalignment="top",
@@ -65,22 +118,7 @@ from matplotlib.animation import FFMpegWriter
 writer = FFMpegWriter(fps=5, bitrate=1800)
 anim.save('RandomAnimation.mp4', writer=writer)
 
+packing_cache.store(__file__, PARAMS, centers, **packing_cache.packing_metrics(centers, r, L))
+
 # --- Generazione immagine finale ---
-fig2, ax2 = plt.subplots(figsize=(6, 6))
-ax2.set_xlim(0, L)
-ax2.set_ylim(0, L)
-ax2.set_aspect('equal')
-ax2.set_title(f"Random - {len(centers)} cerchi")
-
-# Aggiunge rettangolo del bordo
-ax2.add_patch(plt.Rectangle((0, 0), L, L, fill=False, edgecolor='black'))
-
-# Disegna tutti i cerchi finali
-for (x, y) in centers:
-    circle = plt.Circle((x, y), radius=r, fill=True, alpha=0.6)
-    ax2.add_patch(circle)
-
-# Salva come PNG
-plt.savefig("Random_FinalPacking.png", dpi=300)
-plt.close(fig2)
-print(f"Immagine finale salvata in 'FinalPacking.png' con {len(centers)} cerchi.")
\ No newline at end of file
+save_final_image(centers)
@@ -1,7 +1,12 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+import packing_cache
+from compact_state import CompactState
+
 RADIUS       = 0.1
 MIN_DIST     = 2 * RADIUS
 SQUARE_SIZE  = 1.0
@@ -9,6 +14,8 @@ MAX_ADD_FAIL = 200
 OPT_ITERS    = 2000
 STEP_SIZE    = 0.02
 FRAME_STEP   = 20
+SEED         = 0     # None = non riproducibile, niente cache
+COMPACT_STATE = False  # stato float32 + griglia come sorgente di verità nel loop, per N grande
 
 def is_valid(positions):
     for i in range(len(positions)):
@@ -31,42 +38,130 @@ def try_add_circle(positions):
             return np.vstack([positions, p])
     return positions
 
-# Inizializzazione greedy
-positions = np.empty((0, 2))
-while True:
-    new_positions = try_add_circle(positions)
-    if new_positions.shape[0] == positions.shape[0]:
-        break
-    positions = new_positions
-
-# Preallocazione per metriche e raccolta frames
-distances = np.zeros(OPT_ITERS + 1)
-counts    = np.zeros(OPT_ITERS + 1, dtype=int)
-frames    = []
-
-# Stato iniziale
-distances[0] = total_pairwise_distance(positions)
-counts[0]    = len(positions)
-frames.append(positions.copy())
-
-# Ottimizzazione + aggiunta dinamica + raccolta frames
-for it in range(1, OPT_ITERS + 1):
-    idx = np.random.randint(0, len(positions))
-    candidate = positions.copy()
-    candidate[idx] += np.random.uniform(-STEP_SIZE, STEP_SIZE, 2)
-    candidate[idx] = np.clip(candidate[idx], RADIUS, SQUARE_SIZE - RADIUS)
-    if is_valid(candidate) and total_pairwise_distance(candidate) < total_pairwise_distance(positions):
-        positions = candidate
-
-    new_positions = try_add_circle(positions)
-    if new_positions.shape[0] > positions.shape[0]:
+# --- Variante compatta (COMPACT_STATE) ---
+def compact_distance_sum(state, px, py, skip=-1):
+    """Somma delle distanze di (px, py) dai centri dello stato, vettorizzata in O(N)."""
+    n = len(state)
+    d = np.hypot(state.x[:n] - px, state.y[:n] - py)
+    if skip >= 0:
+        d[skip] = 0.0
+    return d.sum(dtype=np.float64)
+
+def compact_total_pairwise_distance(state):
+    """Come total_pairwise_distance, vettorizzata a blocchi sugli array x / y."""
+    n = len(state)
+    x, y = state.x[:n], state.y[:n]
+    # blocchi da ~4M elementi (16 MB in float32) per temporaneo, indipendentemente da N
+    chunk = max(1, (1 << 22) // max(n, 1))
+    total = 0.0
+    for s in range(0, n, chunk):
+        d = np.hypot(x[s:s + chunk, None] - x[None, :], y[s:s + chunk, None] - y[None, :])
+        total += d.sum(dtype=np.float64)
+    return total / 2
+
+def compact_try_add_circle(state):
+    """Come try_add_circle, con verifica sulla griglia; restituisce True se inserito."""
+    for _ in range(MAX_ADD_FAIL):
+        if state.add(*np.random.uniform(RADIUS, SQUARE_SIZE - RADIUS, 2)):
+            return True
+    return False
+
+def compact_search():
+    """
+    Stessa ricerca del ciclo principale con CompactState come unica copia dei centri:
+    - le mosse passano da state.round / state.can_place (verifica sulla griglia, niente is_valid)
+    - la somma delle distanze è aggiornata solo per il cerchio mosso o aggiunto, in O(N)
+    - frames e posizioni finali escono dallo stato, quindi hanno superato la verifica float32
+    """
+    state = CompactState(RADIUS, SQUARE_SIZE)
+    while compact_try_add_circle(state):
+        pass
+
+    distances = np.zeros(OPT_ITERS + 1, dtype=np.float32)
+    counts    = np.zeros(OPT_ITERS + 1, dtype=np.int32)
+    frames    = []
+
+    total = compact_total_pairwise_distance(state)
+    distances[0] = total
+    counts[0]    = len(state)
+    frames.append(state.positions(np.float32))
+
+    for it in range(1, OPT_ITERS + 1):
+        idx = np.random.randint(0, len(state))
+        x0, y0 = state.x[idx], state.y[idx]
+        step = np.random.uniform(-STEP_SIZE, STEP_SIZE, 2)
+        px, py = state.round(float(x0) + step[0], float(y0) + step[1])
+        if state.can_place(px, py, skip=idx):
+            delta = compact_distance_sum(state, px, py, skip=idx) - compact_distance_sum(state, x0, y0, skip=idx)
+            if delta < 0:
+                # già arrotondato e verificato: niente seconda scansione della griglia
+                state.place(idx, px, py)
+                total += delta
+
+        n = len(state)
+        if compact_try_add_circle(state):
+            total += compact_distance_sum(state, state.x[n], state.y[n], skip=n)
+
+        distances[it] = total
+        counts[it]    = len(state)
+
+        if it % FRAME_STEP == 0:
+            frames.append(state.positions(np.float32))
+
+    return state.positions(), distances, counts, frames
+
+np.random.seed(SEED)
+
+# Cache dei risultati: se già calcolato salta ottimizzazione e animazione
+PARAMS = {
+    "RADIUS": RADIUS, "SQUARE_SIZE": SQUARE_SIZE, "MAX_ADD_FAIL": MAX_ADD_FAIL,
+    "OPT_ITERS": OPT_ITERS, "STEP_SIZE": STEP_SIZE, "FRAME_STEP": FRAME_STEP, "SEED": SEED,
+    "COMPACT_STATE": COMPACT_STATE,
+}
+cached = packing_cache.lookup(__file__, PARAMS)
+if cached is not None:
+    print(f"Risultato trovato in cache: {len(cached['positions'])} cerchi.")
+    sys.exit()
+
+if COMPACT_STATE:
+    positions, distances, counts, frames = compact_search()
+else:
+    # Inizializzazione greedy
+    positions = np.empty((0, 2))
+    while True:
+        new_positions = try_add_circle(positions)
+        if new_positions.shape[0] == positions.shape[0]:
+            break
         positions = new_positions
 
-    distances[it] = total_pairwise_distance(positions)
-    counts[it]    = len(positions)
+    # Preallocazione per metriche e raccolta frames
+    distances = np.zeros(OPT_ITERS + 1)
+    counts    = np.zeros(OPT_ITERS + 1, dtype=int)
+    frames    = []
 
-    if it % FRAME_STEP == 0:
-        frames.append(positions.copy())
+    # Stato iniziale
+    distances[0] = total_pairwise_distance(positions)
+    counts[0]    = len(positions)
+    frames.append(positions.copy())
+
+    # Ottimizzazione + aggiunta dinamica + raccolta frames
+    for it in range(1, OPT_ITERS + 1):
+        idx = np.random.randint(0, len(positions))
+        candidate = positions.copy()
+        candidate[idx] += np.random.uniform(-STEP_SIZE, STEP_SIZE, 2)
+        candidate[idx] = np.clip(candidate[idx], RADIUS, SQUARE_SIZE - RADIUS)
+        if is_valid(candidate) and total_pairwise_distance(candidate) < total_pairwise_distance(positions):
+            positions = candidate
+
+        new_positions = try_add_circle(positions)
+        if new_positions.shape[0] > positions.shape[0]:
+            positions = new_positions
+
+        distances[it] = total_pairwise_distance(positions)
+        counts[it]    = len(positions)
+
+        if it % FRAME_STEP == 0:
+            frames.append(positions.copy())
 
 # ANIMAZIONE
 fig, ax = plt.subplots(figsize=(6,6))
@@ -84,3 +179,9 @@ anim = FuncAnimation(fig, update, frames=frames, blit=False, interval=200)
 anim.save('packing_animation.gif', writer='pillow', fps=5)
 plt.close(fig)
 print("Animazione salvata in 'packing_animation.gif'")
+
+packing_cache.store(
+    __file__, PARAMS, positions,
+    distances=distances, counts=counts,
+    **packing_cache.packing_metrics(positions, RADIUS, SQUARE_SIZE)
+)
@@ -1,8 +1,12 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import imageio
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
+import packing_cache
+
 # --- Parametri ---
 RADIUS       = 0.1
 MIN_DIST     = 2 * RADIUS
@@ -12,6 +16,7 @@ STEP_SIZE    = 0.02    # ampiezza passi casuali
 FRAME_STEP   = 20      # ogni quanti its salvo un frame
 MAX_CIRCLES  = 26
 MAX_ADD_FAIL = 20000
+SEED         = 0       # None = non riproducibile, niente cache
 
 # --- Funzioni di utilità ---
 def is_valid(positions):
@@ -44,6 +49,40 @@ def try_add_circle(positions):
     return positions
 
 
+def save_final_image(positions):
+    fig2, ax2 = plt.subplots(figsize=(6,6))
+    ax2.set_xlim(0, SQUARE_SIZE)
+    ax2.set_ylim(0, SQUARE_SIZE)
+    ax2.set_aspect('equal')
+    ax2.set_title(f"Configurazione finale - {len(positions)} cerchi")
+
+    # bordo del quadrato
+    ax2.add_patch(plt.Rectangle((0,0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
+
+    # disegna tutti i cerchi finali
+    for p in positions:
+        ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
+
+    # Salva immagine
+    plt.savefig("FinalPacking_Gradient.png", dpi=300)
+    plt.close(fig2)
+    print(f"Immagine finale salvata in 'FinalPacking_Gradient.png' con {len(positions)} cerchi.")
+
+
+np.random.seed(SEED)
+
+# --- Cache dei risultati: se già calcolato salta ottimizzazione e video ---
+PARAMS = {
+    "RADIUS": RADIUS, "SQUARE_SIZE": SQUARE_SIZE, "OPT_ITERS": OPT_ITERS,
+    "STEP_SIZE": STEP_SIZE, "FRAME_STEP": FRAME_STEP, "MAX_CIRCLES": MAX_CIRCLES,
+    "MAX_ADD_FAIL": MAX_ADD_FAIL, "SEED": SEED,
+}
+cached = packing_cache.lookup(__file__, PARAMS)
+if cached is not None:
+    print(f"Risultato trovato in cache: {len(cached['positions'])} cerchi.")
+    save_final_image(cached["positions"])
+    sys.exit()
+
 # --- Inizializzazione ---
 positions = np.random.uniform(RADIUS, SQUARE_SIZE - RADIUS, (1, 2))
 frames = [positions.copy()]
@@ -105,21 +144,7 @@ for pos in frames:
 
 writer.close()
 
+packing_cache.store(__file__, PARAMS, positions, **packing_cache.packing_metrics(positions, RADIUS, SQUARE_SIZE))
+
 # --- Salvataggio immagine finale ---
-fig2, ax2 = plt.subplots(figsize=(6,6))
-ax2.set_xlim(0, SQUARE_SIZE)
-ax2.set_ylim(0, SQUARE_SIZE)
-ax2.set_aspect('equal')
-ax2.set_title(f"Configurazione finale - {len(positions)} cerchi")
-
-# bordo del quadrato
-ax2.add_patch(plt.Rectangle((0,0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
-
-# disegna tutti i cerchi finali
-for p in positions:
-    ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
-
-# Salva immagine
-plt.savefig("FinalPacking_Gradient.png", dpi=300)
-plt.close(fig2)
-print(f"Immagine finale salvata in 'FinalPacking_Gradient.png' con {len(positions)} cerchi.")
+save_final_image(positions)
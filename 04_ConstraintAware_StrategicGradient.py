@@ -1,8 +1,12 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import imageio
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
+import packing_cache
+
 # --- Parametri ---
 RADIUS      = 0.1
 MIN_DIST    = 2 * RADIUS
@@ -12,6 +16,7 @@ STEP_SIZE   = 0.02   # ampiezza del jitter casuale
 FRAME_STEP  = 20     # ogni quanti passi salvo un frame
 MAX_CIRCLES = 26
 MAX_ADD_FAIL = 20000   # tentativi max per inserimento
+SEED        = 0      # None = non riproducibile, niente cache
 
 # --- Funzioni di utilità ---
 def is_valid(positions):
@@ -35,6 +40,41 @@ def total_pairwise_distance(positions):
         for j in range(i+1, len(positions))
     )
 
+
+def save_final_image(positions):
+    fig2, ax2 = plt.subplots(figsize=(6,6))
+    ax2.set_xlim(0, SQUARE_SIZE)
+    ax2.set_ylim(0, SQUARE_SIZE)
+    ax2.set_aspect('equal')
+    ax2.set_title(f"Configurazione finale - {len(positions)} cerchi (1 fisso)")
+
+    # bordo del quadrato
+    ax2.add_patch(plt.Rectangle((0, 0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
+
+    # disegno dei cerchi
+    for p in positions:
+        ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
+
+    # Salva immagine statica
+    plt.savefig("FinalPacking_FixedAnchor.png", dpi=300)
+    plt.close(fig2)
+    print(f"Immagine finale salvata in 'FinalPacking_FixedAnchor.png' con {len(positions)} cerchi.")
+
+
+np.random.seed(SEED)
+
+# --- Cache dei risultati: se già calcolato salta ottimizzazione e video ---
+PARAMS = {
+    "RADIUS": RADIUS, "SQUARE_SIZE": SQUARE_SIZE, "OPT_ITERS": OPT_ITERS,
+    "STEP_SIZE": STEP_SIZE, "FRAME_STEP": FRAME_STEP, "MAX_CIRCLES": MAX_CIRCLES,
+    "MAX_ADD_FAIL": MAX_ADD_FAIL, "SEED": SEED,
+}
+cached = packing_cache.lookup(__file__, PARAMS)
+if cached is not None:
+    print(f"Risultato trovato in cache: {len(cached['positions'])} cerchi.")
+    save_final_image(cached["positions"])
+    sys.exit()
+
 # --- Inizializzazione ---
 # Primo cerchio fisso in (r, r)
 positions = np.array([[RADIUS, RADIUS]])
@@ -112,21 +152,7 @@ for pos in frames:
 writer.close()
 print("MP4 salvato in 'packing_fixed_anchor.mp4'")
 
+packing_cache.store(__file__, PARAMS, positions, **packing_cache.packing_metrics(positions, RADIUS, SQUARE_SIZE))
+
 # --- Salvataggio immagine finale ---
-fig2, ax2 = plt.subplots(figsize=(6,6))
-ax2.set_xlim(0, SQUARE_SIZE)
-ax2.set_ylim(0, SQUARE_SIZE)
-ax2.set_aspect('equal')
-ax2.set_title(f"Configurazione finale - {len(positions)} cerchi (1 fisso)")
-
-# bordo del quadrato
-ax2.add_patch(plt.Rectangle((0, 0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
-
-# disegno dei cerchi
-for p in positions:
-    ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
-
-# Salva immagine statica
-plt.savefig("FinalPacking_FixedAnchor.png", dpi=300)
-plt.close(fig2)
-print(f"Immagine finale salvata in 'FinalPacking_FixedAnchor.png' con {len(positions)} cerchi.")
+save_final_image(positions)
@@ -1,8 +1,12 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import imageio
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
+import packing_cache
+
 # --- Parametri ---
 RADIUS       = 0.1
 MIN_DIST     = 2 * RADIUS
@@ -15,6 +19,7 @@ MAX_ADD_FAIL = 20000     # tentativi max per inserimento
 T0           = 1.0     # temperatura iniziale
 T_MIN        = 1e-3    # temperatura minima
 ALPHA        = 0.995   # fattore di raffreddamento
+SEED         = 0       # None = non riproducibile, niente cache
 
 # --- Funzioni di utilità ---
 def is_valid(positions):
@@ -38,6 +43,42 @@ def total_pairwise_distance(positions):
         for j in range(i+1, len(positions))
     )
 
+
+def save_final_image(positions):
+    fig2, ax2 = plt.subplots(figsize=(6,6))
+    ax2.set_xlim(0, SQUARE_SIZE)
+    ax2.set_ylim(0, SQUARE_SIZE)
+    ax2.set_aspect('equal')
+    ax2.set_title(f"Configurazione finale - {len(positions)} cerchi (1 fisso)")
+
+    # bordo del quadrato
+    ax2.add_patch(plt.Rectangle((0, 0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
+
+    # disegno dei cerchi
+    for p in positions:
+        ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
+
+    # salva PNG
+    plt.savefig("FinalPacking_SimulatedAnnealing.png", dpi=300)
+    plt.close(fig2)
+    print(f"Immagine finale salvata in 'FinalPacking_SimulatedAnnealing.png' con {len(positions)} cerchi.")
+
+
+np.random.seed(SEED)
+
+# --- Cache dei risultati: se già calcolato salta annealing e video ---
+PARAMS = {
+    "RADIUS": RADIUS, "SQUARE_SIZE": SQUARE_SIZE, "SA_ITERS": SA_ITERS,
+    "STEP_SIZE": STEP_SIZE, "FRAME_STEP": FRAME_STEP, "MAX_CIRCLES": MAX_CIRCLES,
+    "MAX_ADD_FAIL": MAX_ADD_FAIL, "T0": T0, "T_MIN": T_MIN, "ALPHA": ALPHA,
+    "SEED": SEED,
+}
+cached = packing_cache.lookup(__file__, PARAMS)
+if cached is not None:
+    print(f"Risultato trovato in cache: {len(cached['positions'])} cerchi.")
+    save_final_image(cached["positions"])
+    sys.exit()
+
 # --- Inizializzazione ---
 # Primo cerchio fissato in (r, r)
 positions = np.array([[RADIUS, RADIUS]])
@@ -123,21 +164,7 @@ for pos in frames:
 writer.close()
 print("MP4 salvato in 'packing_simulated_annealing.mp4'")
 
+packing_cache.store(__file__, PARAMS, positions, **packing_cache.packing_metrics(positions, RADIUS, SQUARE_SIZE))
+
 # --- Salvataggio immagine finale ---
-fig2, ax2 = plt.subplots(figsize=(6,6))
-ax2.set_xlim(0, SQUARE_SIZE)
-ax2.set_ylim(0, SQUARE_SIZE)
-ax2.set_aspect('equal')
-ax2.set_title(f"Configurazione finale - {len(positions)} cerchi (1 fisso)")
-
-# bordo del quadrato
-ax2.add_patch(plt.Rectangle((0, 0), SQUARE_SIZE, SQUARE_SIZE, fill=False))
-
-# disegno dei cerchi
-for p in positions:
-    ax2.add_patch(plt.Circle(p, RADIUS, fill=True, alpha=0.6))
-
-# salva PNG
-plt.savefig("FinalPacking_SimulatedAnnealing.png", dpi=300)
-plt.close(fig2)
-print(f"Immagine finale salvata in 'FinalPacking_SimulatedAnnealing.png' con {len(positions)} cerchi.")
+save_final_image(positions)
@@ -4,6 +4,8 @@ import imageio
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 from tqdm import tqdm
 
+import packing_cache
+
 # Parametri globali
 RADIUS       = 0.1
 MIN_DIST     = 2 * RADIUS
@@ -14,6 +16,7 @@ EPS          = 1e-8
 FRAME_STEP   = 10
 MAX_SWEEPS   = 50
 TOL          = 1e-6       # criterio stop su loss
+SEED         = 0          # None = non riproducibile, niente cache
 
 # -----------------------------
 # Funzione obiettivo e gradiente
@@ -82,6 +85,20 @@ def add_circle(positions):
 # Esecuzione unica da 1 a max_circles
 # -----------------------------
 def run_gd_session(max_circles=26):
+    params = {
+        "RADIUS": RADIUS, "SQUARE_SIZE": SQUARE_SIZE, "ITERATIONS": ITERATIONS,
+        "ETA": ETA, "EPS": EPS, "FRAME_STEP": FRAME_STEP, "MAX_SWEEPS": MAX_SWEEPS,
+        "TOL": TOL, "SEED": SEED, "max_circles": max_circles,
+    }
+    cached = packing_cache.lookup(__file__, params)
+    if cached is not None:
+        # risultato già calcolato: niente ottimizzazione né video
+        positions = cached["positions"]
+        print(f"Risultato trovato in cache: {len(positions)} cerchi.")
+        save_final_image(positions, max_circles)
+        return positions
+
+    np.random.seed(SEED)
     positions = np.random.uniform(RADIUS, SQUARE_SIZE - RADIUS, (1,2))
     positions = project_feasible(positions)
 
@@ -129,7 +146,18 @@ def run_gd_session(max_circles=26):
     writer.close()
     plt.close(fig)
 
-    # immagine finale
+    packing_cache.store(
+        __file__, params, positions,
+        **packing_cache.packing_metrics(positions, RADIUS, SQUARE_SIZE)
+    )
+    save_final_image(positions, max_circles)
+    return positions
+
+
+# -----------------------------
+# Immagine finale
+# -----------------------------
+def save_final_image(positions, max_circles):
     fig2, ax2 = plt.subplots(figsize=(6,6))
     ax2.set_xlim(0,SQUARE_SIZE); ax2.set_ylim(0,SQUARE_SIZE)
     ax2.set_aspect('equal')
@@ -140,7 +168,6 @@ def run_gd_session(max_circles=26):
     plt.savefig("final.png", dpi=300)
     plt.close(fig2)
 
-    return positions
 
 if __name__ == "__main__":
     run_gd_session(25)
@@ -0,0 +1,163 @@
+import numpy as np
+
+# --- Parametri ---
+COORD_DTYPE = np.float32    # coordinate compatte
+INDEX_DTYPE = np.int32      # indici di cella e liste concatenate
+
+
+class CompactState:
+    """
+    Stato compatto per N molto grandi (r piccolo):
+    - coordinate float32 in due array contigui x / y (structure-of-arrays)
+    - griglia uniforme di celle di lato >= 2r con liste concatenate int32
+      (head per cella, next per cerchio): ogni verifica guarda solo le 9 celle vicine
+    - array preallocati con crescita geometrica, niente vstack a ogni inserimento
+
+    Le verifiche sono consapevoli dell'arrotondamento: il candidato viene prima
+    convertito in float32 e i vincoli sono controllati in float64 sul valore
+    effettivamente memorizzato, con margine opzionale `tol`. Lo stato salvato è
+    quindi ammissibile in modo esatto anche una volta riconvertito in float64.
+    """
+
+    def __init__(self, radius, square_size=1.0, capacity=1024, tol=0.0):
+        self.radius = float(radius)
+        self.square_size = float(square_size)
+        self.min_dist = 2 * self.radius + tol
+        self.min_dist2 = self.min_dist ** 2
+
+        # estremi float32 interni a [r, L-r]
+        lo, hi = self.radius, self.square_size - self.radius
+        lo32, hi32 = COORD_DTYPE(lo), COORD_DTYPE(hi)
+        # confronto in float64: con NEP 50 il float Python verrebbe convertito in float32
+        if float(lo32) < lo:
+            lo32 = np.nextafter(lo32, COORD_DTYPE(np.inf))
+        if float(hi32) > hi:
+            hi32 = np.nextafter(hi32, COORD_DTYPE(-np.inf))
+        self.lo, self.hi = lo32, hi32
+
+        # griglia: lato cella strettamente > distanza minima (margine contro l'arrotondamento)
+        self.n_cells = max(1, int(self.square_size // (self.min_dist * (1 + 1e-9))))
+        self.cell_size = self.square_size / self.n_cells
+        self.head = np.full(self.n_cells * self.n_cells, -1, dtype=INDEX_DTYPE)
+
+        self.n = 0
+        self.x = np.empty(capacity, dtype=COORD_DTYPE)
+        self.y = np.empty(capacity, dtype=COORD_DTYPE)
+        self.cell = np.empty(capacity, dtype=INDEX_DTYPE)
+        self.next = np.empty(capacity, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return self.n
+
+    # -----------------------------
+    # Griglia
+    # -----------------------------
+    def _cell_coords(self, px, py):
+        # sempre in float64: inserimenti, mosse e query devono vedere la stessa cella
+        cx = min(int(float(px) / self.cell_size), self.n_cells - 1)
+        cy = min(int(float(py) / self.cell_size), self.n_cells - 1)
+        return cx, cy
+
+    def _link(self, i, c):
+        self.cell[i] = c
+        self.next[i] = self.head[c]
+        self.head[c] = i
+
+    def _unlink(self, i):
+        c = self.cell[i]
+        j = self.head[c]
+        if j == i:
+            self.head[c] = self.next[i]
+            return
+        while self.next[j] != i:
+            j = self.next[j]
+        self.next[j] = self.next[i]
+
+    def _grow(self):
+        capacity = 2 * len(self.x)
+        for name in ("x", "y", "cell", "next"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    # -----------------------------
+    # Vincoli
+    # -----------------------------
+    def round(self, px, py):
+        """Arrotonda il candidato in float32 e lo riporta dentro [r, L-r]^2."""
+        px = min(max(COORD_DTYPE(px), self.lo), self.hi)
+        py = min(max(COORD_DTYPE(py), self.lo), self.hi)
+        return px, py
+
+    def can_place(self, px, py, skip=-1):
+        """Verifica non sovrapposizione del punto (già in float32) sulle 9 celle vicine."""
+        px, py = float(px), float(py)
+        cx, cy = self._cell_coords(px, py)
+        x, y, nxt, head, n_cells = self.x, self.y, self.next, self.head, self.n_cells
+        for gx in range(max(cx - 1, 0), min(cx + 2, n_cells)):
+            for gy in range(max(cy - 1, 0), min(cy + 2, n_cells)):
+                j = head[gy * n_cells + gx]
+                while j >= 0:
+                    if j != skip:
+                        dx = px - float(x[j])
+                        dy = py - float(y[j])
+                        if dx * dx + dy * dy < self.min_dist2:
+                            return False
+                    j = nxt[j]
+        return True
+
+    # -----------------------------
+    # Modifiche
+    # -----------------------------
+    def add(self, px, py):
+        """Inserisce un cerchio se ammissibile; restituisce True se inserito."""
+        px, py = self.round(px, py)
+        if not self.can_place(px, py):
+            return False
+        if self.n == len(self.x):
+            self._grow()
+        i = self.n
+        self.x[i], self.y[i] = px, py
+        cx, cy = self._cell_coords(px, py)
+        self._link(i, cy * self.n_cells + cx)
+        self.n += 1
+        return True
+
+    def move(self, i, px, py):
+        """Sposta il cerchio i se la nuova posizione è ammissibile."""
+        px, py = self.round(px, py)
+        if not self.can_place(px, py, skip=i):
+            return False
+        self.place(i, px, py)
+        return True
+
+    def place(self, i, px, py):
+        """
+        Sposta il cerchio i senza verifiche: solo per punti già passati da
+        round e can_place(px, py, skip=i), per non ripetere la scansione.
+        """
+        self.x[i], self.y[i] = px, py
+        cx, cy = self._cell_coords(px, py)
+        c = cy * self.n_cells + cx
+        if c != self.cell[i]:
+            self._unlink(i)
+            self._link(i, c)
+
+    # -----------------------------
+    # Esportazione
+    # -----------------------------
+    def positions(self, dtype=float):
+        """Centri come array (N, 2), per disegno, cache e validazione."""
+        P = np.empty((self.n, 2), dtype=dtype)
+        P[:, 0] = self.x[:self.n]
+        P[:, 1] = self.y[:self.n]
+        return P
+
+
+if __name__ == "__main__":
+    # Controllo del caso limite: lato cella pari a 2r e centri float32 a cavallo di una cella
+    state = CompactState(1 / 30)
+    assert state.add(0.8666666746, 0.5)
+    assert not state.add(0.9333333373, 0.5), "coppia sovrapposta accettata"
+    print("compact_state: controlli superati")
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+# --- Parametri della cache ---
+CACHE_DIR       = os.environ.get("PACKING_CACHE_DIR", ".packing_cache")
+CACHE_MAX_BYTES = int(os.environ.get("PACKING_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CACHE_VERSION   = 1    # da incrementare se cambia il formato delle voci
+TMP_MAX_AGE     = 3600  # secondi dopo cui un file .tmp orfano viene rimosso
+
+
+def _local_sources(script_path):
+    """
+    Sorgenti che determinano il risultato: lo script e ogni modulo importato
+    dalla sua stessa cartella (packing_cache, compact_state, ...).
+    """
+    folder = os.path.dirname(os.path.abspath(script_path))
+    paths = {os.path.abspath(script_path)}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and path.endswith(".py") and os.path.dirname(os.path.abspath(path)) == folder:
+            paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def _source_digest(script_path):
+    """Hash dei sorgenti locali: ogni modifica al codice invalida la cache."""
+    digest = hashlib.sha256()
+    for path in _local_sources(script_path):
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def cache_key(script_path, params):
+    """
+    Chiave content-addressed di una esecuzione:
+    - nome dello script e hash dei sorgenti locali (versione del codice)
+    - insieme completo dei parametri (L, r, budget di iterazioni, seed, ...)
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "script": os.path.basename(script_path),
+        "source": _source_digest(script_path),
+        "params": params,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, key + ".npz")
+
+
+def lookup(script_path, params):
+    """
+    Restituisce {"positions": ..., "metrics": {...}} se l'esecuzione è in cache,
+    altrimenti None. Con seed assente (PARAMS["SEED"] is None) il risultato non è
+    riproducibile e la cache viene ignorata.
+    """
+    if params.get("SEED") is None:
+        return None
+    path = _entry_path(cache_key(script_path, params))
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            positions = data["positions"]
+            metrics = {
+                name[len("metric_"):]: data[name]
+                for name in data.files if name.startswith("metric_")
+            }
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        # voce corrotta o troncata: la scarto e ricalcolo
+        _remove(path)
+        return None
+    # aggiorna il tempo di accesso per l'eviction LRU
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass    # rimossa da un altro processo nel frattempo
+    return {"positions": positions, "metrics": metrics}
+
+
+def store(script_path, params, positions, **metrics):
+    """Salva configurazione finale e metriche, poi applica il limite di dimensione."""
+    if params.get("SEED") is None:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _entry_path(cache_key(script_path, params))
+    # scrittura atomica: file temporaneo univoco per processo + rename
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(
+                f,
+                positions=np.asarray(positions, dtype=float).reshape(-1, 2),
+                **{"metric_" + name: np.asarray(value) for name, value in metrics.items()}
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    evict()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass    # già rimosso da un altro processo
+
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """
+    Rimuove le voci usate meno di recente finché la cache supera max_bytes,
+    e i file temporanei lasciati da scritture interrotte.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return
+    now = time.time()
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue    # rimosso da un altro processo
+        if name.endswith(".tmp"):
+            # una scrittura in corso dura pochi secondi: oltre TMP_MAX_AGE è un residuo
+            if now - st.st_mtime > TMP_MAX_AGE:
+                _remove(path)
+        elif name.endswith(".npz"):
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def packing_metrics(positions, radius, square_size):
+    """Metriche standard di una configurazione: numero di cerchi e densità."""
+    n = len(positions)
+    return {
+        "n_circles": n,
+        "density": n * np.pi * radius**2 / square_size**2,
+        "radius": radius,
+        "square_size": square_size,
+    }
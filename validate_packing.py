@@ -0,0 +1,200 @@
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --- Parametri di default ---
+RADIUS      = 0.1
+SQUARE_SIZE = 1.0
+TOL         = 1e-12    # tolleranza numerica sui vincoli
+
+
+def _as_positions(positions):
+    return np.asarray(positions, dtype=float).reshape(-1, 2)
+
+
+def check_boundary(positions, radius=RADIUS, square_size=SQUARE_SIZE, tol=TOL):
+    """Indici dei cerchi che escono dal quadrato [r, L-r]^2."""
+    P = _as_positions(positions)
+    outside = (P < radius - tol) | (P > square_size - radius + tol)
+    return np.nonzero(outside.any(axis=1))[0]
+
+
+def sweep_pairs(positions, radius=RADIUS, tol=TOL):
+    """
+    Sweep ordinato lungo x, vettorizzato sull'offset k fra vicini nell'ordinamento:
+    - restituisce la distanza minima fra i centri (coppia più vicina, esatta)
+    - e le coppie (i, j) con distanza < 2r - tol
+    Un indice esce dal fronte attivo appena dx supera la soglia: per offset
+    maggiori dx può solo crescere, quindi il costo è O(N log N + N * k_max).
+    """
+    P = _as_positions(positions)
+    n = len(P)
+    min_dist = 2 * radius
+    if n < 2:
+        return np.inf, np.empty((0, 2), dtype=np.int64)
+
+    order = np.argsort(P[:, 0], kind="stable")
+    xs, ys = P[order, 0], P[order, 1]
+
+    best = np.inf
+    bad_pairs = []
+    active = np.arange(n - 1)
+    k = 1
+    while active.size:
+        active = active[active + k < n]
+        dx = xs[active + k] - xs[active]
+        # serve guardare oltre 2r solo finché la coppia più vicina non è nota
+        keep = dx < max(best, min_dist)
+        active, dx = active[keep], dx[keep]
+        if not active.size:
+            break
+        dy = ys[active + k] - ys[active]
+        d2 = dx * dx + dy * dy
+        best = min(best, np.sqrt(d2.min()))
+        hit = d2 < (min_dist - tol) ** 2
+        if hit.any():
+            i = order[active[hit]]
+            j = order[active[hit] + k]
+            bad_pairs.append(np.column_stack([np.minimum(i, j), np.maximum(i, j)]))
+        k += 1
+
+    if bad_pairs:
+        bad_pairs = np.concatenate(bad_pairs)
+        bad_pairs = bad_pairs[np.lexsort((bad_pairs[:, 1], bad_pairs[:, 0]))]
+    else:
+        bad_pairs = np.empty((0, 2), dtype=np.int64)
+    return best, bad_pairs
+
+
+def validate(positions, radius=RADIUS, square_size=SQUARE_SIZE, tol=TOL):
+    """Report completo: fattibilità, gap minimo, coppie violate e densità."""
+    P = _as_positions(positions)
+    n = len(P)
+    outside = check_boundary(P, radius, square_size, tol)
+    min_center_dist, overlaps = sweep_pairs(P, radius, tol)
+    if n:
+        wall_gap = min(P.min() - radius, square_size - radius - P.max())
+    else:
+        wall_gap = np.inf
+    return {
+        "n_circles": n,
+        "feasible": outside.size == 0 and overlaps.shape[0] == 0,
+        "min_gap": min_center_dist - 2 * radius,    # gap minimo fra cerchi
+        "min_wall_gap": wall_gap,                   # gap minimo dal bordo
+        "outside": outside,
+        "overlaps": overlaps,
+        "density": n * np.pi * radius**2 / square_size**2,
+    }
+
+
+# -----------------------------
+# Caricamento file
+# -----------------------------
+def _frame_names(files):
+    """Ordine dei frame in un .npz: per suffisso numerico (arr_2 prima di arr_10)."""
+    def key(name):
+        match = re.search(r"(\d+)$", name)
+        return (name[:match.start()], int(match.group(1))) if match else (name, -1)
+    return sorted(files, key=key)
+
+
+def open_frames(path):
+    """
+    Descrive una configurazione o una traiettoria senza caricarne le coordinate:
+    - .npy: array (N, 2) oppure (T, N, 2), letto in memory-map
+    - .npz: voce di packing_cache ("positions") o un array per frame
+    - .txt / .csv: una riga "x y" (o "x,y") per cerchio
+    Restituisce il numero di frame e, se il file li contiene, raggio e lato.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    meta = {}
+    if ext == ".npy":
+        data = np.load(path, mmap_mode="r")
+        n_frames = data.shape[0] if data.ndim == 3 else 1
+    elif ext == ".npz":
+        with np.load(path) as data:
+            if "metric_radius" in data.files:
+                meta["radius"] = float(data["metric_radius"])
+            if "metric_square_size" in data.files:
+                meta["square_size"] = float(data["metric_square_size"])
+            n_frames = 1 if "positions" in data.files else len(data.files)
+    else:
+        n_frames = 1
+    return n_frames, meta
+
+
+def load_frame(path, t=0):
+    """Carica solo il frame t come array (N, 2)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        data = np.load(path, mmap_mode="r")
+        return _as_positions(data[t] if data.ndim == 3 else data)
+    if ext == ".npz":
+        with np.load(path) as data:
+            if "positions" in data.files:
+                return _as_positions(data["positions"])
+            return _as_positions(data[_frame_names(data.files)[t]])
+    delimiter = "," if ext == ".csv" else None
+    return _as_positions(np.loadtxt(path, delimiter=delimiter, ndmin=2))
+
+
+def _validate_frame(args):
+    path, t, radius, square_size, tol = args
+    return validate(load_frame(path, t), radius, square_size, tol)
+
+
+def validate_trajectory(path, radius=RADIUS, square_size=SQUARE_SIZE, tol=TOL, workers=None):
+    """
+    Valida ogni frame del file in streaming: ai processi passano solo percorso e
+    indice, ognuno carica (in memory-map per i .npy) e valida il proprio frame.
+    """
+    n_frames, _ = open_frames(path)
+    tasks = [(path, t, radius, square_size, tol) for t in range(n_frames)]
+    if workers == 1 or len(tasks) < 2:
+        return [_validate_frame(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_validate_frame, tasks, chunksize=max(1, len(tasks) // 64)))
+
+
+def _print_report(label, report, max_pairs):
+    status = "OK" if report["feasible"] else "VIOLATO"
+    print(f"{label}: {status} - {report['n_circles']} cerchi, "
+          f"densità {report['density']:.4f}, "
+          f"gap minimo {report['min_gap']:.3e}, "
+          f"gap dal bordo {report['min_wall_gap']:.3e}")
+    if report["outside"].size:
+        print(f"  {report['outside'].size} cerchi fuori dal bordo: {report['outside'][:max_pairs].tolist()}")
+    if report["overlaps"].shape[0]:
+        print(f"  {report['overlaps'].shape[0]} coppie sovrapposte: {report['overlaps'][:max_pairs].tolist()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica vincoli di bordo e non sovrapposizione di un packing.")
+    parser.add_argument("path", help="file .npy / .npz / .txt / .csv con i centri (o una traiettoria)")
+    parser.add_argument("--radius", type=float, default=None, help=f"raggio dei cerchi (default {RADIUS})")
+    parser.add_argument("--side", type=float, default=None, help=f"lato del quadrato (default {SQUARE_SIZE})")
+    parser.add_argument("--tol", type=float, default=TOL, help="tolleranza numerica sui vincoli")
+    parser.add_argument("--workers", type=int, default=None, help="processi per validare la traiettoria")
+    parser.add_argument("--max-pairs", type=int, default=10, help="violazioni mostrate per frame")
+    args = parser.parse_args(argv)
+
+    _, meta = open_frames(args.path)
+    radius = args.radius if args.radius is not None else meta.get("radius", RADIUS)
+    side = args.side if args.side is not None else meta.get("square_size", SQUARE_SIZE)
+
+    reports = validate_trajectory(args.path, radius, side, args.tol, args.workers)
+    for t, report in enumerate(reports):
+        label = f"Frame {t}" if len(reports) > 1 else os.path.basename(args.path)
+        _print_report(label, report, args.max_pairs)
+
+    n_bad = sum(not rep["feasible"] for rep in reports)
+    if len(reports) > 1:
+        print(f"{len(reports) - n_bad}/{len(reports)} frame ammissibili.")
+    return 1 if n_bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())